@@ -4,24 +4,231 @@ Uses Claude AI to analyze news articles and identify top stories
 """
 
 import anthropic
-import json
+import asyncio
+import html
 import logging
-from typing import List, Dict
+import time
+from typing import Callable, List, Dict, Optional, Tuple
+
+from article import Article, dedupe_articles
+from llm_cache import ResponseCache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Article descriptions sent to Claude are cut to this many characters
+DESCRIPTION_CHAR_LIMIT = 100
+
+# Full-article excerpts attached to top stories are cut to this many characters
+EXCERPT_CHAR_LIMIT = 800
+
+# Filler words dropped from descriptions before they go into the prompt
+STOP_WORDS = frozenset("""
+a an the and or but if of to in on at by for with from as into onto about
+is are was were be been being has have had do does did this that these those
+it its it's their there which who whom whose will would can could should may
+might just very also than then so such
+""".split())
+
+# custom_id for single-request Message Batches submissions
+BATCH_CUSTOM_ID = "newsletter-request"
+
+# The system blocks below carry cache_control, but Anthropic only caches
+# prefixes of at least 1024 tokens (more on some models). At their current
+# sizes (~430 tokens for analysis and for generation) nothing is cached; the
+# markers only start to pay off if the instructions grow past that minimum.
+
+# Pieces of the story-selection instructions, shared by the analysis prompt
+# and the single-call prompt used by analyze_and_generate
+_SELECTION_INPUT = "The user will provide the audience, the number of top stories to select, and a numbered list of today's articles."
+
+_SELECTION_TASK = """Your task:
+1. Identify the requested number of most newsworthy and engaging stories that would appeal to this audience
+2. Group related stories into thematic categories
+3. For each selected story, explain why it's important and what the audience should know"""
+
+_SELECTION_FOCUS = """Focus on stories that are:
+- Timely and relevant
+- Impact the audience's work or interests
+- Have interesting angles or unexpected developments
+- Can be made engaging with the right framing"""
+
+# Static instructions for story selection. Kept separate from the per-run
+# article list so Anthropic can cache this prefix between calls.
+ANALYSIS_INSTRUCTIONS = f"""You are a newsletter editor analyzing news articles for a target audience.
+
+{_SELECTION_INPUT}
+
+{_SELECTION_TASK}
+
+Report your selection by calling the report_top_stories tool.
+
+{_SELECTION_FOCUS}"""
+
+# Tool used to get the story selection back as structured JSON
+REPORT_TOP_STORIES_TOOL = {
+    "name": "report_top_stories",
+    "description": "Report the selected top stories, themes and overall narrative.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "top_stories": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "article_numbers": {
+                            "type": "array",
+                            "items": {"type": "integer"},
+                            "description": "Reference numbers from the article list"
+                        },
+                        "category": {
+                            "type": "string",
+                            "description": "Thematic category, e.g. AI & Technology"
+                        },
+                        "headline": {
+                            "type": "string",
+                            "description": "Catchy headline summarizing the story/stories"
+                        },
+                        "why_it_matters": {
+                            "type": "string",
+                            "description": "Brief explanation of significance"
+                        },
+                        "key_points": {
+                            "type": "array",
+                            "items": {"type": "string"}
+                        }
+                    },
+                    "required": [
+                        "article_numbers", "category", "headline", "why_it_matters", "key_points"
+                    ]
+                }
+            },
+            "themes": {
+                "type": "array",
+                "items": {"type": "string"}
+            },
+            "overall_narrative": {
+                "type": "string",
+                "description": "What's the bigger picture today?"
+            }
+        },
+        "required": ["top_stories", "themes", "overall_narrative"]
+    }
+}
+
+# How the newsletter itself is written, shared by generation and analyze_and_generate
+_NEWSLETTER_WRITING_GUIDE = """Write a complete newsletter following the Morning Brew style. Include:
+
+1. A catchy subject line
+2. An opening "What's Brewing" section with bullet points
+3. 3-5 main stories written in the Morning Brew tone:
+   - Conversational and witty
+   - Start with the hook, explain why it matters
+   - Use metaphors to explain complex concepts
+   - Keep paragraphs to 2-3 sentences max
+   - Include relevant links
+4. A "Grab Bag" section with 2-3 quick hits
+5. A fun closing
+
+Use HTML formatting for the newsletter:
+- <h1> for the newsletter title
+- <h2> for major sections
+- <h3> for story headlines
+- <p> for paragraphs
+- <ul> and <li> for lists
+- <a> for links
+- <strong> for emphasis
+
+Make it engaging, informative, and fun to read. Remember: you're the smart friend explaining the news over coffee."""
+
+# Static writing instructions for newsletter generation, appended to the
+# newsletter name and style guide to form the cached system prompt
+NEWSLETTER_INSTRUCTIONS = f"""The user will provide today's context and the stories to cover.
+
+{_NEWSLETTER_WRITING_GUIDE}"""
+
+# Static instructions for selecting stories and writing the newsletter in one call
+COMBINED_INSTRUCTIONS = f"""{_SELECTION_INPUT}
+
+First, select the stories.
+
+{_SELECTION_TASK}
+
+{_SELECTION_FOCUS}
+
+Then write the newsletter, covering only the selected stories.
+
+{_NEWSLETTER_WRITING_GUIDE}
+
+Report the selection and the finished HTML newsletter together by calling the write_newsletter tool."""
+
+# Tool for analyze_and_generate: the story selection plus the newsletter HTML
+WRITE_NEWSLETTER_TOOL = {
+    "name": "write_newsletter",
+    "description": "Report the selected top stories and the finished newsletter.",
+    "input_schema": {
+        **REPORT_TOP_STORIES_TOOL["input_schema"],
+        "properties": {
+            **REPORT_TOP_STORIES_TOOL["input_schema"]["properties"],
+            "newsletter_html": {
+                "type": "string",
+                "description": "The complete newsletter as HTML"
+            }
+        },
+        "required": REPORT_TOP_STORIES_TOOL["input_schema"]["required"] + ["newsletter_html"]
+    }
+}
+
 
 class NewsAnalyzer:
     """Analyzes news articles using Claude AI"""
 
-    def __init__(self, api_key: str, model: str = "claude-sonnet-4-5-20250929"):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "claude-sonnet-4-5-20250929",
+        cache_path: Optional[str] = None,
+        analysis_cache_ttl: int = 60 * 60,
+        generation_cache_ttl: int = 24 * 60 * 60,
+        batch_mode: bool = False,
+        batch_poll_interval: int = 30,
+        analysis_max_tokens: int = 2048,
+        analysis_temperature: float = 0.0,
+        generation_max_tokens: int = 4000,
+        generation_temperature: float = 0.8
+    ):
+        """
+        Args:
+            api_key: Anthropic API key
+            model: Claude model name
+            cache_path: SQLite file for caching responses (disabled if None)
+            analysis_cache_ttl: Seconds a cached analysis response stays valid
+            generation_cache_ttl: Seconds a cached newsletter response stays valid
+            batch_mode: Send requests through the Message Batches API (half price, slower)
+            batch_poll_interval: Seconds between batch status checks in batch mode
+            analysis_max_tokens: Output cap for story selection (its tool call rarely
+                passes ~1500 tokens)
+            analysis_temperature: Sampling temperature for story selection; 0 keeps the
+                selection stable so identical inputs hit the response cache
+            generation_max_tokens: Output cap for the newsletter HTML
+            generation_temperature: Sampling temperature for the newsletter prose
+        """
         self.client = anthropic.Anthropic(api_key=api_key)
         self.model = model
+        self.cache = ResponseCache(cache_path) if cache_path else None
+        self.analysis_cache_ttl = analysis_cache_ttl
+        self.generation_cache_ttl = generation_cache_ttl
+        self.batch_mode = batch_mode
+        self.batch_poll_interval = batch_poll_interval
+        self.analysis_max_tokens = analysis_max_tokens
+        self.analysis_temperature = analysis_temperature
+        self.generation_max_tokens = generation_max_tokens
+        self.generation_temperature = generation_temperature
 
     def analyze_and_select_top_stories(
         self,
-        articles: List[Dict],
+        articles: List[Article],
         audience: str,
         top_count: int = 5
     ) -> Dict:
@@ -37,109 +244,25 @@ class NewsAnalyzer:
             Dictionary containing top stories and analysis
         """
         logger.info(f"Analyzing {len(articles)} articles with Claude AI...")
-
-        # Prepare article summaries for AI
-        article_summaries = []
-        for i, article in enumerate(articles):
-            summary = f"{i+1}. [{article['source']}] {article['title']}"
-            if article.get('description'):
-                summary += f" - {article['description'][:150]}"
-            article_summaries.append(summary)
-
-        articles_text = "\n".join(article_summaries)
-
-        prompt = f"""You are a newsletter editor analyzing news articles for an audience of {audience}.
-
-Here are today's articles:
-
-{articles_text}
-
-Your task:
-1. Identify the {top_count} most newsworthy and engaging stories that would appeal to this audience
-2. Group related stories into thematic categories
-3. For each selected story, explain why it's important and what the audience should know
-
-Respond in JSON format:
-{{
-    "top_stories": [
-        {{
-            "article_numbers": [1, 5],  // Reference numbers from the list above
-            "category": "AI & Technology",
-            "headline": "Catchy headline summarizing the story/stories",
-            "why_it_matters": "Brief explanation of significance",
-            "key_points": ["Point 1", "Point 2"]
-        }}
-    ],
-    "themes": ["Theme 1", "Theme 2", "Theme 3"],
-    "overall_narrative": "What's the bigger picture today?"
-}}
-
-Focus on stories that are:
-- Timely and relevant
-- Impact the audience's work or interests
-- Have interesting angles or unexpected developments
-- Can be made engaging with the right framing"""
+        articles = dedupe_articles(articles)
 
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=4000,
-                temperature=0.7,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+            response = self._cached_messages_create(
+                ttl=self.analysis_cache_ttl,
+                **self._build_analysis_request(articles, audience, top_count)
             )
-
-            # Extract JSON from response
-            response_text = response.content[0].text
-
-            # Try to parse JSON from response
-            # Sometimes the model wraps JSON in markdown code blocks
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                response_text = response_text[json_start:json_end].strip()
-
-            analysis = json.loads(response_text)
-
-            # Map article numbers back to actual articles
-            for story in analysis.get('top_stories', []):
-                story['articles'] = [
-                    articles[num - 1] for num in story.get('article_numbers', [])
-                    if 0 < num <= len(articles)
-                ]
-
-            logger.info(f"AI identified {len(analysis.get('top_stories', []))} top stories")
-            return analysis
+            return self._parse_analysis(response, articles)
 
         except Exception as e:
             logger.error(f"Error analyzing articles: {str(e)}")
-            # Return a basic fallback structure
-            return {
-                "top_stories": [
-                    {
-                        "article_numbers": [i+1],
-                        "category": article['source'],
-                        "headline": article['title'],
-                        "why_it_matters": "Breaking news",
-                        "key_points": [],
-                        "articles": [article]
-                    }
-                    for i, article in enumerate(articles[:top_count])
-                ],
-                "themes": ["Technology", "Business"],
-                "overall_narrative": "Today's top stories from the tech world."
-            }
+            return self._fallback_analysis(articles, top_count)
 
     def generate_newsletter_content(
         self,
         analysis: Dict,
         newsletter_name: str,
-        style_guide: str
+        style_guide: str,
+        sink: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Generate the full newsletter content in Morning Brew style
@@ -148,12 +271,220 @@ Focus on stories that are:
             analysis: Analysis from analyze_and_select_top_stories
             newsletter_name: Name of the newsletter
             style_guide: Style guidelines to follow
+            sink: Optional callback that receives the raw model output as it streams in
 
         Returns:
             Newsletter content as HTML
         """
         logger.info("Generating newsletter content with Claude AI...")
 
+        try:
+            response = self._cached_messages_create(
+                ttl=self.generation_cache_ttl,
+                sink=sink,
+                **self._build_newsletter_request(analysis, newsletter_name, style_guide)
+            )
+            return self._parse_newsletter(response)
+
+        except Exception as e:
+            logger.error(f"Error generating newsletter: {str(e)}")
+            raise
+
+    def analyze_and_generate(
+        self,
+        articles: List[Article],
+        audience: str,
+        top_count: int,
+        newsletter_name: str,
+        style_guide: str
+    ) -> Tuple[Dict, str]:
+        """
+        Select the top stories and write the newsletter in a single Claude call
+
+        The article list is sent once instead of once for selection and again
+        (as the selected stories) for writing. Falls back to the separate
+        analyze/generate calls if the combined call fails.
+
+        Args:
+            articles: List of scraped articles
+            audience: Target audience description
+            top_count: Number of top stories to select
+            newsletter_name: Name of the newsletter
+            style_guide: Style guidelines to follow
+
+        Returns:
+            Tuple of (analysis, newsletter HTML)
+        """
+        logger.info(f"Analyzing {len(articles)} articles and writing the newsletter in one call...")
+        articles = dedupe_articles(articles)
+
+        try:
+            response = self._cached_messages_create(
+                ttl=self.generation_cache_ttl,
+                **self._build_combined_request(
+                    articles, audience, top_count, newsletter_name, style_guide
+                )
+            )
+            return self._parse_combined(response, articles)
+
+        except Exception as e:
+            logger.warning(f"Single-call generation failed, using separate calls: {str(e)}")
+            analysis = self.analyze_and_select_top_stories(articles, audience, top_count)
+            return analysis, self.generate_newsletter_content(analysis, newsletter_name, style_guide)
+
+    def _build_analysis_request(
+        self,
+        articles: List[Article],
+        audience: str,
+        top_count: int
+    ) -> Dict:
+        """Build the messages.create arguments for story selection"""
+        return {
+            "max_tokens": self.analysis_max_tokens,
+            "temperature": self.analysis_temperature,
+            "system": [
+                {
+                    "type": "text",
+                    "text": ANALYSIS_INSTRUCTIONS,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ],
+            "tools": [REPORT_TOP_STORIES_TOOL],
+            "tool_choice": {"type": "tool", "name": REPORT_TOP_STORIES_TOOL["name"]},
+            "messages": [
+                {"role": "user", "content": self._build_articles_prompt(articles, audience, top_count)}
+            ]
+        }
+
+    def _build_combined_request(
+        self,
+        articles: List[Article],
+        audience: str,
+        top_count: int,
+        newsletter_name: str,
+        style_guide: str
+    ) -> Dict:
+        """Build the messages.create arguments for analyze_and_generate"""
+        system_prompt = f"""You are the editor of "{newsletter_name}", a newsletter written in the style of Morning Brew.
+
+STYLE GUIDE:
+{style_guide}
+
+{COMBINED_INSTRUCTIONS}"""
+
+        return {
+            # Room for both the selection and the full newsletter
+            "max_tokens": self.analysis_max_tokens + self.generation_max_tokens,
+            "temperature": self.generation_temperature,
+            "system": [
+                {
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ],
+            "tools": [WRITE_NEWSLETTER_TOOL],
+            "tool_choice": {"type": "tool", "name": WRITE_NEWSLETTER_TOOL["name"]},
+            "messages": [
+                {"role": "user", "content": self._build_articles_prompt(articles, audience, top_count)}
+            ]
+        }
+
+    def _build_articles_prompt(self, articles: List[Article], audience: str, top_count: int) -> str:
+        """Build the user prompt listing the audience and today's numbered articles"""
+        # Prepare compact article summaries for AI
+        articles_text = "\n".join(
+            f"{i+1}. {self._compress_article_for_prompt(article)}"
+            for i, article in enumerate(articles)
+        )
+        # Rough estimate (~4 characters per token) to keep an eye on prompt size
+        logger.info(f"Article list is roughly {len(articles_text) // 4} tokens")
+
+        return f"""Audience: {audience}
+Number of top stories to select: {top_count}
+
+Here are today's articles:
+
+{articles_text}"""
+
+    def _compress_article_for_prompt(self, article: Article) -> str:
+        """Serialize an article as a short "[source] title - description" line"""
+        summary = f"[{article.source}] {article.title}"
+        if not article.description:
+            return summary
+
+        words = html.unescape(article.description).split()
+        description = " ".join(w for w in words if w.lower() not in STOP_WORDS)
+
+        if len(description) > DESCRIPTION_CHAR_LIMIT:
+            cut = description[:DESCRIPTION_CHAR_LIMIT]
+            # Prefer ending on a full stop, otherwise on a word boundary; a stop
+            # early in the text is more likely an abbreviation ("St.", "Dr.")
+            sentence_end = cut.rfind('. ')
+            if sentence_end >= DESCRIPTION_CHAR_LIMIT // 2:
+                description = cut[:sentence_end + 1]
+            else:
+                description = cut.rsplit(' ', 1)[0]
+
+        return f"{summary} - {description}" if description else summary
+
+    def _parse_analysis(
+        self,
+        response: anthropic.types.Message,
+        articles: List[Article],
+        tool_name: str = REPORT_TOP_STORIES_TOOL["name"]
+    ) -> Dict:
+        """Extract the analysis from the tool call in a response and attach source articles"""
+        self._log_usage(response)
+
+        # The forced tool call carries the analysis as an already-parsed dict
+        tool_input = next(
+            (
+                block.input for block in response.content
+                if block.type == "tool_use" and block.name == tool_name
+            ),
+            None
+        )
+        if tool_input is None:
+            raise ValueError(f"No {tool_name} tool call in response")
+
+        analysis = dict(tool_input)
+
+        # Map article numbers back to actual articles
+        for story in analysis.get('top_stories', []):
+            story['articles'] = [
+                articles[num - 1] for num in story.get('article_numbers', [])
+                if 0 < num <= len(articles)
+            ]
+
+        logger.info(f"AI identified {len(analysis.get('top_stories', []))} top stories")
+        return analysis
+
+    def _fallback_analysis(self, articles: List[Article], top_count: int) -> Dict:
+        """Return a basic analysis structure when the AI call fails"""
+        return {
+            "top_stories": [
+                {
+                    "article_numbers": [i+1],
+                    "category": article.source,
+                    "headline": article.title,
+                    "why_it_matters": "Breaking news",
+                    "key_points": [],
+                    "articles": [article]
+                }
+                for i, article in enumerate(articles[:top_count])
+            ],
+            "themes": ["Technology", "Business"],
+            "overall_narrative": "Today's top stories from the tech world."
+        }
+
+    def _build_newsletter_request(
+        self,
+        analysis: Dict,
+        newsletter_name: str,
+        style_guide: str
+    ) -> Dict:
+        """Build the messages.create arguments for newsletter generation"""
         # Prepare the stories for the prompt
         stories_summary = []
         for i, story in enumerate(analysis.get('top_stories', [])):
@@ -162,11 +493,15 @@ Focus on stories that are:
             story_text += f"Why it matters: {story.get('why_it_matters', '')}\n"
             story_text += f"Key points: {', '.join(story.get('key_points', []))}\n"
 
-            # Add source articles
+            # Add source articles, with any prefetched article text
+            excerpts = story.get('excerpts', {})
             for article in story.get('articles', []):
-                story_text += f"  - [{article['source']}] {article['title']}\n"
-                if article.get('link'):
-                    story_text += f"    Link: {article['link']}\n"
+                story_text += f"  - [{article.source}] {article.title}\n"
+                if article.link:
+                    story_text += f"    Link: {article.link}\n"
+                excerpt = excerpts.get(article.link)
+                if excerpt:
+                    story_text += f"    Excerpt: {' '.join(excerpt.split())[:EXCERPT_CHAR_LIMIT]}\n"
 
             stories_summary.append(story_text)
 
@@ -174,67 +509,302 @@ Focus on stories that are:
         themes = ", ".join(analysis.get('themes', []))
         narrative = analysis.get('overall_narrative', '')
 
-        prompt = f"""You are the editor of "{newsletter_name}", a newsletter written in the style of Morning Brew.
+        system_prompt = f"""You are the editor of "{newsletter_name}", a newsletter written in the style of Morning Brew.
 
 STYLE GUIDE:
 {style_guide}
 
-TODAY'S CONTEXT:
+{NEWSLETTER_INSTRUCTIONS}"""
+
+        prompt = f"""TODAY'S CONTEXT:
 Overall narrative: {narrative}
 Key themes: {themes}
 
 STORIES TO COVER:
-{stories_text}
-
-Write a complete newsletter following the Morning Brew style. Include:
+{stories_text}"""
+
+        return {
+            "max_tokens": self.generation_max_tokens,
+            "temperature": self.generation_temperature,
+            "system": [
+                {
+                    "type": "text",
+                    "text": system_prompt,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ],
+            "messages": [
+                {"role": "user", "content": prompt}
+            ]
+        }
+
+    def _parse_newsletter(self, response: anthropic.types.Message) -> str:
+        """Extract the newsletter HTML from a response"""
+        self._log_usage(response)
+
+        newsletter_html = self._strip_code_fence(response.content[0].text)
+
+        logger.info("Newsletter content generated successfully")
+        return newsletter_html
+
+    def _parse_combined(
+        self,
+        response: anthropic.types.Message,
+        articles: List[Article]
+    ) -> Tuple[Dict, str]:
+        """Split a write_newsletter tool call into the analysis and the newsletter HTML"""
+        analysis = self._parse_analysis(response, articles, WRITE_NEWSLETTER_TOOL["name"])
+        newsletter_html = self._strip_code_fence(analysis.pop('newsletter_html', ''))
+        if not newsletter_html:
+            raise ValueError("write_newsletter tool call has no newsletter_html")
+
+        logger.info("Newsletter content generated successfully")
+        return analysis, newsletter_html
+
+    @staticmethod
+    def _strip_code_fence(newsletter_html: str) -> str:
+        """Return the HTML inside a markdown code block, if the text is wrapped in one"""
+        if "```html" in newsletter_html:
+            html_start = newsletter_html.find("```html") + 7
+            html_end = newsletter_html.find("```", html_start)
+            newsletter_html = newsletter_html[html_start:html_end].strip()
+        elif "```" in newsletter_html:
+            html_start = newsletter_html.find("```") + 3
+            html_end = newsletter_html.find("```", html_start)
+            newsletter_html = newsletter_html[html_start:html_end].strip()
+
+        return newsletter_html
+
+    def _cached_messages_create(
+        self,
+        ttl: int,
+        sink: Optional[Callable[[str], None]] = None,
+        **params
+    ) -> anthropic.types.Message:
+        """
+        Call messages.create, reusing a cached response for identical requests
 
-1. A catchy subject line
-2. An opening "What's Brewing" section with bullet points
-3. 3-5 main stories written in the Morning Brew tone:
-   - Conversational and witty
-   - Start with the hook, explain why it matters
-   - Use metaphors to explain complex concepts
-   - Keep paragraphs to 2-3 sentences max
-   - Include relevant links
-4. A "Grab Bag" section with 2-3 quick hits
-5. A fun closing
+        Args:
+            ttl: Seconds a cached response stays valid
+            sink: Optional callback for streamed response text
+            **params: Arguments for messages.create (model is filled in)
 
-Use HTML formatting for the newsletter:
-- <h1> for the newsletter title
-- <h2> for major sections
-- <h3> for story headlines
-- <p> for paragraphs
-- <ul> and <li> for lists
-- <a> for links
-- <strong> for emphasis
+        Returns:
+            The Claude response message
+        """
+        params['model'] = self.model
+        if self.cache is None:
+            return self._create_message(params, sink)
+
+        key = ResponseCache.make_key(params)
+        response_json = self.cache.get(key, ttl)
+        if response_json is not None:
+            logger.info(f"LLM cache hit ({key[:12]})")
+            response = anthropic.types.Message.model_validate_json(response_json)
+            self._emit_text(response, sink)
+            return response
+
+        response = self._create_message(params, sink)
+        self.cache.set(key, response.model_dump_json())
+        return response
+
+    def _create_message(
+        self,
+        params: Dict,
+        sink: Optional[Callable[[str], None]] = None
+    ) -> anthropic.types.Message:
+        """
+        Send a request directly, or through the Message Batches API in batch mode
 
-Make it engaging, informative, and fun to read. Remember: you're the smart friend explaining the news over coffee."""
+        With a sink, direct requests are streamed and each text delta is
+        passed to the sink as it arrives.
+        """
+        if not self.batch_mode:
+            if sink is None:
+                return self.client.messages.create(**params)
+
+            with self.client.messages.stream(**params) as stream:
+                for text in stream.text_stream:
+                    sink(text)
+                return stream.get_final_message()
+
+        response = self._create_message_batch(params)
+        self._emit_text(response, sink)
+        return response
+
+    def _create_message_batch(self, params: Dict) -> anthropic.types.Message:
+        """Submit a single request through the Message Batches API and wait for it"""
+        batch = self.client.messages.batches.create(
+            requests=[{"custom_id": BATCH_CUSTOM_ID, "params": params}]
+        )
+        logger.info(f"Submitted message batch {batch.id}, waiting for results...")
+
+        while batch.processing_status != "ended":
+            time.sleep(self.batch_poll_interval)
+            batch = self.client.messages.batches.retrieve(batch.id)
+
+        for result in self.client.messages.batches.results(batch.id):
+            return self._batch_result_message(result)
+
+        raise RuntimeError(f"Message batch {batch.id} returned no results")
+
+    def _emit_text(self, response: anthropic.types.Message, sink: Optional[Callable[[str], None]]) -> None:
+        """Pass the full text of a finished response to the sink, if there is one"""
+        if sink is None:
+            return
+        text = "".join(block.text for block in response.content if block.type == "text")
+        if text:
+            sink(text)
+
+    def _batch_result_message(self, result) -> anthropic.types.Message:
+        """Return the message from a batch result, raising if the request did not succeed"""
+        if result.result.type != "succeeded":
+            raise RuntimeError(f"Batch request {result.custom_id} {result.result.type}")
+        return result.result.message
+
+    def _log_usage(self, response) -> None:
+        """Log token usage, including prompt cache hits"""
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return
+        logger.info(
+            f"Token usage: {usage.input_tokens} input, {usage.output_tokens} output, "
+            f"{getattr(usage, 'cache_read_input_tokens', 0) or 0} cache read, "
+            f"{getattr(usage, 'cache_creation_input_tokens', 0) or 0} cache write"
+        )
+
+
+class AsyncNewsAnalyzer(NewsAnalyzer):
+    """Async variant of NewsAnalyzer so Claude calls can overlap with other I/O"""
+
+    def __init__(self, api_key: str, **kwargs):
+        super().__init__(api_key, **kwargs)
+        self.client = anthropic.AsyncAnthropic(api_key=api_key)
+
+    async def analyze_and_select_top_stories(
+        self,
+        articles: List[Article],
+        audience: str,
+        top_count: int = 5
+    ) -> Dict:
+        """Async version of NewsAnalyzer.analyze_and_select_top_stories"""
+        logger.info(f"Analyzing {len(articles)} articles with Claude AI...")
+        articles = dedupe_articles(articles)
 
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=4000,
-                temperature=0.8,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+            response = await self._cached_messages_create(
+                ttl=self.analysis_cache_ttl,
+                **self._build_analysis_request(articles, audience, top_count)
             )
+            return self._parse_analysis(response, articles)
 
-            newsletter_html = response.content[0].text
+        except Exception as e:
+            logger.error(f"Error analyzing articles: {str(e)}")
+            return self._fallback_analysis(articles, top_count)
 
-            # If the response is wrapped in markdown code blocks, extract it
-            if "```html" in newsletter_html:
-                html_start = newsletter_html.find("```html") + 7
-                html_end = newsletter_html.find("```", html_start)
-                newsletter_html = newsletter_html[html_start:html_end].strip()
-            elif "```" in newsletter_html:
-                html_start = newsletter_html.find("```") + 3
-                html_end = newsletter_html.find("```", html_start)
-                newsletter_html = newsletter_html[html_start:html_end].strip()
+    async def generate_newsletter_content(
+        self,
+        analysis: Dict,
+        newsletter_name: str,
+        style_guide: str,
+        sink: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """Async version of NewsAnalyzer.generate_newsletter_content"""
+        logger.info("Generating newsletter content with Claude AI...")
 
-            logger.info("Newsletter content generated successfully")
-            return newsletter_html
+        try:
+            response = await self._cached_messages_create(
+                ttl=self.generation_cache_ttl,
+                sink=sink,
+                **self._build_newsletter_request(analysis, newsletter_name, style_guide)
+            )
+            return self._parse_newsletter(response)
 
         except Exception as e:
             logger.error(f"Error generating newsletter: {str(e)}")
             raise
+
+    async def analyze_and_generate(
+        self,
+        articles: List[Article],
+        audience: str,
+        top_count: int,
+        newsletter_name: str,
+        style_guide: str
+    ) -> Tuple[Dict, str]:
+        """Async version of NewsAnalyzer.analyze_and_generate"""
+        logger.info(f"Analyzing {len(articles)} articles and writing the newsletter in one call...")
+        articles = dedupe_articles(articles)
+
+        try:
+            response = await self._cached_messages_create(
+                ttl=self.generation_cache_ttl,
+                **self._build_combined_request(
+                    articles, audience, top_count, newsletter_name, style_guide
+                )
+            )
+            return self._parse_combined(response, articles)
+
+        except Exception as e:
+            logger.warning(f"Single-call generation failed, using separate calls: {str(e)}")
+            analysis = await self.analyze_and_select_top_stories(articles, audience, top_count)
+            content = await self.generate_newsletter_content(analysis, newsletter_name, style_guide)
+            return analysis, content
+
+    async def _cached_messages_create(
+        self,
+        ttl: int,
+        sink: Optional[Callable[[str], None]] = None,
+        **params
+    ) -> anthropic.types.Message:
+        """Async version of NewsAnalyzer._cached_messages_create"""
+        params['model'] = self.model
+        if self.cache is None:
+            return await self._create_message(params, sink)
+
+        key = ResponseCache.make_key(params)
+        response_json = self.cache.get(key, ttl)
+        if response_json is not None:
+            logger.info(f"LLM cache hit ({key[:12]})")
+            response = anthropic.types.Message.model_validate_json(response_json)
+            self._emit_text(response, sink)
+            return response
+
+        response = await self._create_message(params, sink)
+        self.cache.set(key, response.model_dump_json())
+        return response
+
+    async def _create_message(
+        self,
+        params: Dict,
+        sink: Optional[Callable[[str], None]] = None
+    ) -> anthropic.types.Message:
+        """Async version of NewsAnalyzer._create_message"""
+        if not self.batch_mode:
+            if sink is None:
+                return await self.client.messages.create(**params)
+
+            async with self.client.messages.stream(**params) as stream:
+                async for text in stream.text_stream:
+                    sink(text)
+                return await stream.get_final_message()
+
+        response = await self._create_message_batch(params)
+        self._emit_text(response, sink)
+        return response
+
+    async def _create_message_batch(self, params: Dict) -> anthropic.types.Message:
+        """Async version of NewsAnalyzer._create_message_batch"""
+        batch = await self.client.messages.batches.create(
+            requests=[{"custom_id": BATCH_CUSTOM_ID, "params": params}]
+        )
+        logger.info(f"Submitted message batch {batch.id}, waiting for results...")
+
+        while batch.processing_status != "ended":
+            await asyncio.sleep(self.batch_poll_interval)
+            batch = await self.client.messages.batches.retrieve(batch.id)
+
+        async for result in await self.client.messages.batches.results(batch.id):
+            return self._batch_result_message(result)
+
+        raise RuntimeError(f"Message batch {batch.id} returned no results")
@@ -0,0 +1,102 @@
+"""
+Article Module
+Compact record type shared by the scrapers and the AI analyzer,
+plus title-based deduplication
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+
+@dataclass
+class Article:
+    """A scraped news article"""
+
+    __slots__ = ('title', 'link', 'source', 'date', 'description', 'scraped_at')
+
+    title: str
+    link: str
+    source: str
+    date: Optional[str]
+    description: str
+    scraped_at: str
+
+
+# Titles whose character shingles overlap at least this much (Jaccard) are duplicates
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+_NON_ALNUM_RE = re.compile(r'[\W_]')
+
+
+def _normalize_title(title: str) -> str:
+    """Lower-case a title and keep only (Unicode) letters and digits"""
+    return _NON_ALNUM_RE.sub('', title.lower())[:80]
+
+
+def _shingles(text: str, size: int = 5) -> Set[str]:
+    """Return the set of overlapping character shingles of text"""
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def dedupe_articles(articles: List[Article]) -> List[Article]:
+    """
+    Drop articles that repeat a story already in the list
+
+    Exact duplicates are found by hashing the normalized title. Near
+    duplicates are found through an inverted index of title shingles, so
+    each article is only compared with earlier articles that share at
+    least one shingle. When two articles match, the one with the longer
+    description is kept in the position of the first.
+
+    Args:
+        articles: Articles in their original order
+
+    Returns:
+        Deduplicated list of articles
+    """
+    kept: List[Article] = []
+    kept_shingles: List[Set[str]] = []
+    by_title: Dict[str, int] = {}
+    shingle_index: Dict[str, List[int]] = defaultdict(list)
+
+    for article in articles:
+        title = _normalize_title(article.title)
+        if not title:
+            # Nothing left to compare on, so keep the article as is
+            kept.append(article)
+            kept_shingles.append(set())
+            continue
+
+        match = by_title.get(title)
+        shingles = None
+
+        if match is None:
+            shingles = _shingles(title)
+            overlap: Dict[int, int] = defaultdict(int)
+            for shingle in shingles:
+                for index in shingle_index[shingle]:
+                    overlap[index] += 1
+            for index, common in overlap.items():
+                union = len(shingles) + len(kept_shingles[index]) - common
+                if common / union >= NEAR_DUPLICATE_THRESHOLD:
+                    match = index
+                    break
+
+        if match is not None:
+            if len(article.description or '') > len(kept[match].description or ''):
+                kept[match] = article
+            by_title[title] = match
+            continue
+
+        index = len(kept)
+        kept.append(article)
+        kept_shingles.append(shingles)
+        by_title[title] = index
+        for shingle in shingles:
+            shingle_index[shingle].append(index)
+
+    return kept
@@ -4,29 +4,88 @@ Automatically extracts news articles without manual CSS selectors
 Supports RSS feeds and AI-powered content extraction
 """
 
+import asyncio
+import html
+import re
 import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from dateutil import parser as date_parser
 from typing import List, Dict, Optional
 import logging
 import feedparser
+from lxml import etree
 from urllib.parse import urljoin
 
+from article import Article, dedupe_articles
+from html_select import absolute_url, compile_css, element_text, parse_html
+from http_client import (
+    ConditionalCache, charset_from_content_type, create_session, modified_before
+)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Used by _clean_html to strip markup from short RSS summaries
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+# Content types that mean a URL is already a feed rather than an HTML page
+_FEED_CONTENT_TYPE_RE = re.compile(r'(rss|atom)\+xml|/xml', re.IGNORECASE)
+
+# Feed <link> types looked for during discovery, in order of preference
+_FEED_LINK_TYPES = ('application/rss+xml', 'application/atom+xml')
+
+# Opening <body> tag in the raw page bytes; feed links are not looked for past it
+_BODY_TAG_RE = re.compile(rb'<body[\s>]', re.IGNORECASE)
+
+
+# Heuristic selectors for pages without RSS, compiled at import time
+_ARTICLE_SELECTORS = [compile_css(s) for s in (
+    'article',
+    '[class*="article"]',
+    '[class*="story"]',
+    '[class*="post"]',
+    '[class*="card"]',
+    '[class*="item"]'
+)]
+_TITLE_SELECTORS = [compile_css(s) for s in (
+    'h1', 'h2', 'h3', '[class*="title"]', '[class*="headline"]'
+)]
+_DESC_SELECTORS = [compile_css(s) for s in (
+    'p', '[class*="description"]', '[class*="summary"]', '[class*="excerpt"]'
+)]
+_LINK_SELECTOR = compile_css('a[href]')
+_TIME_SELECTOR = compile_css('time')
+
 
 class AutoScraper:
     """Automatically scrapes articles using RSS feeds or AI extraction"""
 
-    def __init__(self, sources: List[Dict]):
+    MAX_WORKERS = 16
+    POOL_SIZE = 32
+
+    def __init__(
+        self,
+        sources: List[Dict],
+        cache_path: Optional[str] = None,
+        cache_expire_after: int = 0
+    ):
+        """
+        Args:
+            sources: Source configurations (name plus rss_url or url)
+            cache_path: SQLite file for conditional-GET caching of feeds (disabled if None)
+            cache_expire_after: Seconds a cached feed is reused without revalidating
+        """
         self.sources = sources
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        self.session = create_session(self.headers, pool_size=self.POOL_SIZE)
+        self.http_cache = (
+            ConditionalCache(cache_path, expire_after=cache_expire_after) if cache_path else None
+        )
 
-    def scrape_all_sources(self, hours_ago: int = 24) -> List[Dict]:
+    def scrape_all_sources(self, hours_ago: int = 24) -> List[Article]:
         """
         Scrape articles from all configured sources
 
@@ -34,57 +93,119 @@ class AutoScraper:
             hours_ago: Only include articles from the last N hours
 
         Returns:
-            List of article dictionaries
+            List of articles
         """
         all_articles = []
-        cutoff_time = datetime.now() - timedelta(hours=hours_ago)
-
-        for source in self.sources:
-            logger.info(f"Scraping {source['name']}...")
-            try:
-                # Try RSS first if available
-                if 'rss_url' in source:
-                    articles = self._scrape_rss(source, cutoff_time)
-                else:
-                    # Try to auto-discover RSS or use intelligent extraction
-                    articles = self._auto_scrape(source, cutoff_time)
-
-                all_articles.extend(articles)
-                logger.info(f"Found {len(articles)} articles from {source['name']}")
-            except Exception as e:
-                logger.error(f"Error scraping {source['name']}: {str(e)}")
-
-        return all_articles
-
-    def _scrape_rss(self, source: Dict, cutoff_time: datetime) -> List[Dict]:
+        now = datetime.now()
+        cutoff_time = now - timedelta(hours=hours_ago)
+        # One timestamp for the whole run instead of one per article
+        run_ts = now.isoformat()
+
+        if not self.sources:
+            return all_articles
+
+        # Sources are independent network fetches, so scrape them concurrently.
+        # Results are collected in config order to keep the article list stable.
+        max_workers = min(self.MAX_WORKERS, len(self.sources))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._scrape_one, source, cutoff_time, run_ts)
+                for source in self.sources
+            ]
+            for future in futures:
+                all_articles.extend(future.result())
+
+        return self._dedupe(all_articles)
+
+    async def scrape_all_sources_async(self, hours_ago: int = 24) -> List[Article]:
+        """
+        Async version of scrape_all_sources
+
+        Each source is scraped on the event loop's default executor, so the
+        caller can await the scrape alongside other coroutines.
+
+        Args:
+            hours_ago: Only include articles from the last N hours
+
+        Returns:
+            List of articles
+        """
+        now = datetime.now()
+        cutoff_time = now - timedelta(hours=hours_ago)
+        run_ts = now.isoformat()
+
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(None, self._scrape_one, source, cutoff_time, run_ts)
+            for source in self.sources
+        ))
+
+        return self._dedupe([article for articles in results for article in articles])
+
+    def _dedupe(self, articles: List[Article]) -> List[Article]:
+        """Drop repeated stories; the same wire story often runs on several local outlets"""
+        unique_articles = dedupe_articles(articles)
+        if len(unique_articles) < len(articles):
+            logger.info(f"Removed {len(articles) - len(unique_articles)} duplicate articles")
+        return unique_articles
+
+    def _scrape_one(self, source: Dict, cutoff_time: datetime, run_ts: str) -> List[Article]:
+        """Scrape a single source, logging and swallowing any errors"""
+        logger.info(f"Scraping {source['name']}...")
+        try:
+            # Try RSS first if available
+            if 'rss_url' in source:
+                articles = self._scrape_rss(source, cutoff_time, run_ts)
+            else:
+                # Try to auto-discover RSS or use intelligent extraction
+                articles = self._auto_scrape(source, cutoff_time, run_ts)
+
+            logger.info(f"Found {len(articles)} articles from {source['name']}")
+            return articles
+        except Exception as e:
+            logger.error(f"Error scraping {source['name']}: {str(e)}")
+            return []
+
+    def _scrape_rss(self, source: Dict, cutoff_time: datetime, run_ts: str) -> List[Article]:
         """Scrape articles from RSS feed"""
         try:
-            feed = feedparser.parse(source['rss_url'])
+            feed = self._fetch_feed(source['rss_url'], cutoff_time)
+            if feed is None:
+                return []
             articles = []
 
-            for entry in feed.entries:
-                # Parse publication date
-                pub_date = None
-                if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                    pub_date = datetime(*entry.published_parsed[:6])
-                elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                    pub_date = datetime(*entry.updated_parsed[:6])
+            # Compare (year, month, day, hour, minute, second) tuples directly
+            # instead of building a datetime for every entry
+            cutoff_struct = cutoff_time.timetuple()[:6]
+
+            # Feeds are usually newest-first; if the first entries agree,
+            # stop at the first entry older than the cutoff
+            head_times = [t for t in map(self._entry_time, feed.entries[:3]) if t]
+            assume_sorted = len(head_times) >= 2 and all(
+                newer >= older for newer, older in zip(head_times, head_times[1:])
+            )
 
+            for entry in feed.entries:
                 # Check if recent enough
-                if pub_date and pub_date < cutoff_time:
+                pub_time = self._entry_time(entry)
+                if pub_time and pub_time < cutoff_struct:
+                    if assume_sorted:
+                        break
                     continue
 
-                # Extract article data
-                article = {
-                    'title': entry.get('title', ''),
-                    'link': entry.get('link', ''),
-                    'source': source['name'],
-                    'date': entry.get('published', entry.get('updated', '')),
-                    'description': self._clean_html(entry.get('summary', entry.get('description', ''))),
-                    'scraped_at': datetime.now().isoformat()
-                }
-
-                if article['title']:
+                # Extract article data. The fallbacks are only looked up when
+                # the preferred key is missing or empty.
+                get = entry.get
+                article = Article(
+                    title=get('title', ''),
+                    link=get('link', ''),
+                    source=source['name'],
+                    date=get('published') or get('updated', ''),
+                    description=self._clean_html(get('summary') or get('description', '')),
+                    scraped_at=run_ts
+                )
+
+                if article.title:
                     articles.append(article)
 
             return articles
@@ -93,7 +214,45 @@ class AutoScraper:
             logger.error(f"RSS parsing failed for {source['name']}: {str(e)}")
             return []
 
-    def _auto_scrape(self, source: Dict, cutoff_time: datetime) -> List[Dict]:
+    def _entry_time(self, entry) -> Optional[tuple]:
+        """Return an entry's publication (or update) time as a 6-tuple, if it has one"""
+        # dict lookups avoid FeedParserDict's exception-driven __getattr__ path
+        parsed = entry.get('published_parsed') or entry.get('updated_parsed')
+        return tuple(parsed[:6]) if parsed else None
+
+    def _fetch_feed(self, rss_url: str, cutoff_time: datetime) -> Optional[feedparser.FeedParserDict]:
+        """
+        Download a feed with an explicit timeout and parse it
+
+        Returns None without parsing when the feed's Last-Modified predates
+        cutoff_time, since none of its entries can be recent.
+        """
+        if self.http_cache is not None:
+            result = self.http_cache.fetch(self.session, rss_url, timeout=10)
+            if modified_before(result.last_modified, cutoff_time):
+                logger.info(f"Skipping {rss_url}: not modified since {result.last_modified}")
+                return None
+            content, content_type = result.content, result.content_type
+            base_url = rss_url
+        else:
+            # Streamed so a stale feed's body is never downloaded
+            with self.session.get(rss_url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                last_modified = response.headers.get('Last-Modified')
+                if modified_before(last_modified, cutoff_time):
+                    logger.info(f"Skipping {rss_url}: not modified since {last_modified}")
+                    return None
+                content, content_type = response.content, response.headers.get('Content-Type')
+                base_url = response.url
+
+        # Parsing bytes loses the feed's URL; content-location gives feedparser
+        # the base it needs to resolve relative entry links
+        response_headers = {'content-location': base_url}
+        if content_type:
+            response_headers['content-type'] = content_type
+        return feedparser.parse(content, response_headers=response_headers)
+
+    def _auto_scrape(self, source: Dict, cutoff_time: datetime, run_ts: str) -> List[Article]:
         """
         Automatically scrape using intelligent extraction
         First tries to find RSS, then falls back to HTML parsing
@@ -103,26 +262,27 @@ class AutoScraper:
         if rss_url:
             logger.info(f"Auto-discovered RSS feed: {rss_url}")
             source['rss_url'] = rss_url
-            return self._scrape_rss(source, cutoff_time)
+            return self._scrape_rss(source, cutoff_time, run_ts)
 
         # Fall back to intelligent HTML parsing
-        return self._scrape_html_intelligent(source, cutoff_time)
+        return self._scrape_html_intelligent(source, cutoff_time, run_ts)
 
     def _discover_rss(self, url: str) -> Optional[str]:
         """Try to auto-discover RSS feeds from a website"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'lxml')
+            with self.session.get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+
+                # The URL may already be the feed itself
+                if _FEED_CONTENT_TYPE_RE.search(response.headers.get('Content-Type', '')):
+                    return url
 
-            # Look for RSS link tags
-            rss_link = soup.find('link', type='application/rss+xml')
-            if rss_link and rss_link.get('href'):
-                return urljoin(url, rss_link['href'])
+                feed_links = self._read_feed_links(response)
 
-            atom_link = soup.find('link', type='application/atom+xml')
-            if atom_link and atom_link.get('href'):
-                return urljoin(url, atom_link['href'])
+            # Look for RSS link tags, then Atom
+            for feed_type in _FEED_LINK_TYPES:
+                if feed_type in feed_links:
+                    return urljoin(url, feed_links[feed_type])
 
             # Common RSS URL patterns to try
             from urllib.parse import urlparse
@@ -137,53 +297,100 @@ class AutoScraper:
                 f"{base_url}/feed",
             ]
 
-            for pattern in common_patterns:
-                try:
-                    test_response = requests.head(pattern, headers=self.headers, timeout=5)
-                    if test_response.status_code == 200:
-                        return pattern
-                except:
-                    continue
-
-            return None
+            return self._probe_feed_urls(common_patterns)
 
         except Exception as e:
             logger.debug(f"RSS discovery failed: {str(e)}")
             return None
 
-    def _scrape_html_intelligent(self, source: Dict, cutoff_time: datetime) -> List[Dict]:
+    def _read_feed_links(self, response: requests.Response) -> Dict[str, str]:
+        """
+        Collect feed <link> tags from a streamed HTML response up to its <body>
+
+        Feed links live in the head, so the (often large) body of a news
+        homepage is not downloaded in full. The end of the head is taken
+        from the raw <body> tag rather than from libxml2, which closes the
+        head early on any stray <div> or <span> in it.
+
+        Returns:
+            First href seen for each feed link type; empty if the page
+            has none or cannot be parsed
+        """
+        parser = etree.HTMLPullParser(events=('start',), tag='link')
+        feed_links: Dict[str, str] = {}
+
+        def collect():
+            for _, link in parser.read_events():
+                feed_type, href = link.get('type'), link.get('href')
+                if feed_type in _FEED_LINK_TYPES and href:
+                    feed_links.setdefault(feed_type, href)
+
+        try:
+            tail = b''
+            for chunk in response.iter_content(chunk_size=16384):
+                parser.feed(chunk)
+                collect()
+                # Keep a few bytes so a tag split across chunks is still seen
+                if _BODY_TAG_RE.search(tail + chunk):
+                    break
+                tail = chunk[-5:]
+            else:
+                parser.close()
+                collect()
+        except etree.Error as e:
+            logger.debug(f"Could not parse page for feed links: {str(e)}")
+
+        return feed_links
+
+    def _probe_feed_urls(self, candidates: List[str]) -> Optional[str]:
+        """Send HEAD requests to all candidate URLs at once and return the first that answers 200"""
+        executor = ThreadPoolExecutor(max_workers=len(candidates))
+        futures = {
+            executor.submit(self.session.head, candidate, timeout=5): candidate
+            for candidate in candidates
+        }
+        try:
+            for future in as_completed(futures):
+                try:
+                    with future.result() as response:
+                        if response.status_code == 200:
+                            return futures[future]
+                except Exception:
+                    continue
+            return None
+        finally:
+            # Don't wait on probes that are still in flight once we have an answer
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def _scrape_html_intelligent(self, source: Dict, cutoff_time: datetime, run_ts: str) -> List[Article]:
         """
         Intelligent HTML scraping without manual selectors
         Uses common patterns and heuristics
         """
         try:
-            response = requests.get(source['url'], headers=self.headers, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'lxml')
+            with self.session.get(source['url'], timeout=10) as response:
+                response.raise_for_status()
+                tree = parse_html(
+                    response.content,
+                    charset_from_content_type(response.headers.get('Content-Type'))
+                )
 
             articles = []
 
             # Try common article patterns
-            article_selectors = [
-                'article',
-                '[class*="article"]',
-                '[class*="story"]',
-                '[class*="post"]',
-                '[class*="card"]',
-                '[class*="item"]'
-            ]
-
             article_elements = []
-            for selector in article_selectors:
-                elements = soup.select(selector)
+            for selector in _ARTICLE_SELECTORS:
+                elements = selector(tree)
                 if elements:
                     article_elements = elements
                     break
 
             for element in article_elements[:30]:  # Limit to first 30
                 try:
-                    article = self._extract_article_intelligent(element, source['name'], source['url'])
-                    if article and article['title']:
+                    article = self._extract_article_intelligent(element, source['name'], source['url'], run_ts)
+                    if article and article.title:
                         articles.append(article)
                 except Exception as e:
                     logger.debug(f"Error extracting article: {str(e)}")
@@ -195,16 +402,21 @@ class AutoScraper:
             logger.error(f"Request failed for {source['url']}: {str(e)}")
             return []
 
-    def _extract_article_intelligent(self, element, source_name: str, base_url: str) -> Optional[Dict]:
+    def _extract_article_intelligent(
+        self,
+        element,
+        source_name: str,
+        base_url: str,
+        run_ts: str
+    ) -> Optional[Article]:
         """Extract article data using intelligent patterns"""
 
         # Find title - try multiple patterns
         title = None
-        title_selectors = ['h1', 'h2', 'h3', '[class*="title"]', '[class*="headline"]']
-        for selector in title_selectors:
-            title_elem = element.select_one(selector)
-            if title_elem:
-                title = title_elem.get_text(strip=True)
+        for selector in _TITLE_SELECTORS:
+            title_elems = selector(element)
+            if title_elems:
+                title = element_text(title_elems[0])
                 if title and len(title) > 10:  # Reasonable title length
                     break
 
@@ -213,43 +425,44 @@ class AutoScraper:
 
         # Find link
         link = None
-        link_elem = element.find('a', href=True)
-        if link_elem:
-            link = link_elem['href']
-            if link and not link.startswith('http'):
-                link = urljoin(base_url, link)
+        link_elems = _LINK_SELECTOR(element)
+        if link_elems:
+            link = link_elems[0].get('href')
+            if link:
+                link = absolute_url(link, base_url)
 
         # Find date
         date_str = None
-        time_elem = element.find('time')
-        if time_elem:
-            date_str = time_elem.get('datetime') or time_elem.get_text(strip=True)
+        time_elems = _TIME_SELECTOR(element)
+        if time_elems:
+            date_str = time_elems[0].get('datetime') or element_text(time_elems[0])
 
         # Find description
         description = ""
-        desc_selectors = ['p', '[class*="description"]', '[class*="summary"]', '[class*="excerpt"]']
-        for selector in desc_selectors:
-            desc_elem = element.select_one(selector)
-            if desc_elem:
-                description = desc_elem.get_text(strip=True)
+        for selector in _DESC_SELECTORS:
+            desc_elems = selector(element)
+            if desc_elems:
+                description = element_text(desc_elems[0])
                 if description and len(description) > 20:
                     break
 
-        return {
-            'title': title,
-            'link': link or '',
-            'source': source_name,
-            'date': date_str,
-            'description': description,
-            'scraped_at': datetime.now().isoformat()
-        }
+        return Article(
+            title=title,
+            link=link or '',
+            source=source_name,
+            date=date_str,
+            description=description,
+            scraped_at=run_ts
+        )
 
     def _clean_html(self, html_text: str) -> str:
         """Remove HTML tags from text"""
         if not html_text:
             return ""
-        soup = BeautifulSoup(html_text, 'lxml')
-        return soup.get_text(strip=True)
+        # RSS summaries are small fragments, so a regex pass is much cheaper
+        # than building a BeautifulSoup tree for each entry
+        text = html.unescape(_TAG_RE.sub(' ', html_text))
+        return _WS_RE.sub(' ', text).strip()
 
 
 # Common RSS feed URLs for Ottawa news sources
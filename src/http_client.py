@@ -0,0 +1,204 @@
+"""
+HTTP Client Module
+Shared requests session setup and conditional-GET cache for the scrapers
+"""
+
+import codecs
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, NamedTuple, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def create_session(headers: Dict[str, str], pool_size: int = 16) -> requests.Session:
+    """
+    Create a requests session that pools connections across threads
+
+    Keep-alive connections are reused per host, transient gateway errors
+    are retried with a short backoff, and every compression scheme urllib3
+    can decode here is advertised (brotli/zstd when those packages are
+    installed, otherwise gzip and deflate).
+
+    Args:
+        headers: Default headers sent with every request
+        pool_size: Number of hosts and connections per host kept in the pool
+
+    Returns:
+        Configured requests session
+    """
+    session = requests.Session()
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    session.headers.update(headers)
+
+    retries = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retries
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    return session
+
+
+def modified_before(last_modified: Optional[str], cutoff_time: datetime) -> bool:
+    """
+    Check whether a Last-Modified header predates a cutoff
+
+    Args:
+        last_modified: Last-Modified header value (may be missing)
+        cutoff_time: Naive local cutoff time
+
+    Returns:
+        True only if the header parses and is older than cutoff_time
+    """
+    if not last_modified:
+        return False
+
+    try:
+        modified = parsedate_to_datetime(last_modified)
+    except (TypeError, ValueError, IndexError):
+        return False
+    if modified is None:
+        return False
+
+    # Last-Modified is in GMT; compare in local time like the cutoff
+    if modified.tzinfo is not None:
+        modified = modified.astimezone().replace(tzinfo=None)
+    return modified < cutoff_time
+
+
+def charset_from_content_type(content_type: Optional[str]) -> Optional[str]:
+    """
+    Return the charset declared in a Content-Type header
+
+    Unlike requests' Response.encoding, a text/* type without a charset
+    parameter gives None rather than ISO-8859-1, so the parser can still
+    detect the encoding from the page itself.
+
+    Args:
+        content_type: Content-Type header value (may be missing)
+
+    Returns:
+        Charset name, or None if absent or unknown to Python
+    """
+    if not content_type:
+        return None
+
+    for param in content_type.split(';')[1:]:
+        key, _, value = param.partition('=')
+        if key.strip().lower() == 'charset':
+            charset = value.strip().strip('"\'')
+            try:
+                codecs.lookup(charset)
+            except LookupError:
+                return None
+            return charset
+
+    return None
+
+
+class FetchResult(NamedTuple):
+    """Body and validators of a fetched URL"""
+    content: bytes
+    content_type: Optional[str]
+    last_modified: Optional[str]
+
+
+class ConditionalCache:
+    """Stores response bodies with their ETag/Last-Modified for conditional GETs"""
+
+    def __init__(self, path: str = ".http_cache.sqlite", expire_after: int = 0):
+        """
+        Args:
+            path: SQLite file holding the cached responses
+            expire_after: Seconds a stored body is served without contacting the
+                server at all (0 always revalidates)
+        """
+        self.path = path
+        self.expire_after = expire_after
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS http_cache ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, "
+                "content_type TEXT, body BLOB, fetched_at INTEGER)"
+            )
+
+    def fetch(self, session: requests.Session, url: str, timeout: int = 10) -> FetchResult:
+        """
+        GET a URL, sending the stored validators and reusing the stored body on 304
+
+        Args:
+            session: Session to send the request with
+            url: URL to fetch
+            timeout: Request timeout in seconds
+
+        Returns:
+            FetchResult for the URL
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, content_type, body, fetched_at "
+                "FROM http_cache WHERE url = ?",
+                (url,)
+            ).fetchone()
+
+        if row is not None and time.time() - row[4] < self.expire_after:
+            logger.info(f"Using fresh cached copy: {url}")
+            return FetchResult(row[3], row[2], row[1])
+
+        headers = {}
+        if row is not None:
+            etag, last_modified = row[0], row[1]
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        with session.get(url, headers=headers, timeout=timeout) as response:
+            if response.status_code == 304 and row is not None:
+                logger.info(f"Not modified since last fetch: {url}")
+                # Revalidated, so the stored body is fresh again
+                with self._lock, self._conn:
+                    self._conn.execute(
+                        "UPDATE http_cache SET fetched_at = ?, etag = COALESCE(?, etag) "
+                        "WHERE url = ?",
+                        (int(time.time()), response.headers.get('ETag'), url)
+                    )
+                return FetchResult(row[3], row[2], row[1])
+
+            response.raise_for_status()
+
+            result = FetchResult(
+                response.content,
+                response.headers.get('Content-Type'),
+                response.headers.get('Last-Modified')
+            )
+            etag = response.headers.get('ETag')
+
+        # Without validators a stored body is only useful while it is fresh
+        if etag or result.last_modified or self.expire_after:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO http_cache "
+                    "(url, etag, last_modified, content_type, body, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, etag, result.last_modified, result.content_type,
+                     result.content, int(time.time()))
+                )
+
+        return result
@@ -0,0 +1,61 @@
+"""
+LLM Response Cache Module
+Stores Claude responses in SQLite so identical requests skip the API call
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+
+class ResponseCache:
+    """Persistent key/value cache for serialized Claude responses"""
+
+    def __init__(self, path: str = ".llm_cache.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, response BLOB, created_at INTEGER)"
+            )
+
+    @staticmethod
+    def make_key(params: Dict) -> str:
+        """
+        Build a deterministic cache key for a request
+
+        Args:
+            params: Request parameters (model, temperature, max_tokens, prompt, ...)
+
+        Returns:
+            SHA256 hex digest of the canonical JSON encoding
+        """
+        payload = json.dumps(params, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str, ttl: int) -> Optional[str]:
+        """Return the cached response for key, or None if missing or older than ttl seconds"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None or time.time() - row[1] > ttl:
+            return None
+
+        return zlib.decompress(row[0]).decode('utf-8')
+
+    def set(self, key: str, response: str) -> None:
+        """Store a serialized response under key"""
+        blob = zlib.compress(response.encode('utf-8'))
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, response, created_at) VALUES (?, ?, ?)",
+                (key, blob, int(time.time()))
+            )
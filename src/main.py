@@ -5,14 +5,13 @@ Coordinates the entire newsletter generation process
 
 import os
 import sys
-import yaml
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import Dict
 
 from scraper import ArticleScraper
-from ai_analyzer import NewsAnalyzer
 from newsletter_formatter import NewsletterFormatter
 
 logging.basicConfig(
@@ -53,6 +52,7 @@ class NewsletterGenerator:
             config_path: Path to configuration file
         """
         # Load environment variables
+        from dotenv import load_dotenv
         load_dotenv()
 
         # Load configuration
@@ -63,10 +63,26 @@ class NewsletterGenerator:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
 
-        self.scraper = ArticleScraper(self.config['sources'])
+        scraper_config = self.config.get('scraper') or {}
+        self.scraper = ArticleScraper(
+            self.config['sources'],
+            cache_path=scraper_config.get('cache_path'),
+            cache_expire_after=scraper_config.get('cache_expire_after', 0)
+        )
+        ai_config = self.config.get('ai', {})
+        # The Anthropic SDK takes over a second to import; keep it off the --help path
+        from ai_analyzer import NewsAnalyzer
         self.analyzer = NewsAnalyzer(
             api_key=api_key,
-            model=self.config.get('ai', {}).get('model', 'claude-sonnet-4-5-20250929')
+            model=ai_config.get('model', 'claude-sonnet-4-5-20250929'),
+            cache_path=ai_config.get('cache_path'),
+            analysis_cache_ttl=ai_config.get('analysis_cache_ttl', 60 * 60),
+            generation_cache_ttl=ai_config.get('generation_cache_ttl', 24 * 60 * 60),
+            batch_mode=ai_config.get('batch_mode', False),
+            analysis_max_tokens=ai_config.get('analysis_max_tokens', 2048),
+            analysis_temperature=ai_config.get('analysis_temperature', 0.0),
+            generation_max_tokens=ai_config.get('generation_max_tokens', 4000),
+            generation_temperature=ai_config.get('generation_temperature', 0.8)
         )
         self.formatter = NewsletterFormatter()
 
@@ -83,6 +99,7 @@ class NewsletterGenerator:
                 "No configuration file found. Please create config.yaml based on config.example.yaml"
             )
 
+        import yaml
         with open(config_file, 'r') as f:
             return yaml.safe_load(f)
 
@@ -123,11 +140,32 @@ class NewsletterGenerator:
         max_articles = newsletter_settings.get('max_articles', len(articles))
         articles = articles[:max_articles]
 
-        analysis = self.analyzer.analyze_and_select_top_stories(
-            articles=articles,
-            audience=audience,
-            top_count=top_count
-        )
+        # Optionally fetch full article text while Claude picks the stories,
+        # so the page fetches are hidden behind the analysis round-trip
+        prefetch_executor = None
+        prefetched = {}
+        try:
+            if newsletter_settings.get('fetch_full_articles', False):
+                prefetch_executor = ThreadPoolExecutor(max_workers=ArticleScraper.MAX_WORKERS)
+                prefetched = {
+                    article.link: prefetch_executor.submit(self.scraper.get_article_content, article.link)
+                    for article in articles if article.link
+                }
+
+            analysis = self.analyzer.analyze_and_select_top_stories(
+                articles=articles,
+                audience=audience,
+                top_count=top_count
+            )
+
+            if prefetch_executor is not None:
+                self._attach_excerpts(analysis, prefetched)
+        finally:
+            if prefetch_executor is not None:
+                # Don't wait on fetches that are still queued or in flight
+                for future in prefetched.values():
+                    future.cancel()
+                prefetch_executor.shutdown(wait=False)
 
         logger.info(f"✓ Identified {len(analysis.get('top_stories', []))} top stories")
         logger.info(f"  Themes: {', '.join(analysis.get('themes', []))}")
@@ -173,6 +211,30 @@ class NewsletterGenerator:
 
         return str(output_path)
 
+    def _attach_excerpts(self, analysis: Dict, prefetched: Dict) -> None:
+        """
+        Attach prefetched article text to the selected stories
+
+        Only fetches that have already finished are used; generation never
+        waits on a page that is still downloading.
+
+        Args:
+            analysis: Analysis results; each top story gains an 'excerpts' dict keyed by link
+            prefetched: Futures of get_article_content keyed by article link
+        """
+        attached = 0
+        for story in analysis.get('top_stories', []):
+            excerpts = {}
+            for article in story.get('articles', []):
+                future = prefetched.get(article.link)
+                if future is None or not future.done() or future.cancelled():
+                    continue
+                excerpts[article.link] = future.result(timeout=0)
+                attached += 1
+            story['excerpts'] = excerpts
+
+        logger.info(f"✓ Attached full text for {attached} selected articles")
+
 
 def main():
     """Main entry point"""
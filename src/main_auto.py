@@ -3,16 +3,17 @@ Main Orchestrator - Auto Scraping Version
 Uses RSS feeds and automatic extraction (no manual CSS selectors!)
 """
 
+import asyncio
 import os
+import re
 import sys
-import yaml
 import logging
 from datetime import datetime
 from pathlib import Path
-from dotenv import load_dotenv
+from typing import Dict, List, Optional
 
+from article import Article
 from auto_scraper import AutoScraper
-from ai_analyzer import NewsAnalyzer
 from newsletter_formatter import NewsletterFormatter
 
 logging.basicConfig(
@@ -53,6 +54,7 @@ class NewsletterGenerator:
             config_path: Path to configuration file
         """
         # Load environment variables
+        from dotenv import load_dotenv
         load_dotenv()
 
         # Load configuration
@@ -63,10 +65,27 @@ class NewsletterGenerator:
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
 
-        self.scraper = AutoScraper(self.config['sources'])
-        self.analyzer = NewsAnalyzer(
+        scraper_config = self.config.get('scraper') or {}
+        self.scraper = AutoScraper(
+            self.config['sources'],
+            cache_path=scraper_config.get('cache_path'),
+            cache_expire_after=scraper_config.get('cache_expire_after', 0)
+        )
+        ai_config = self.config.get('ai', {})
+        self.single_call = ai_config.get('single_call', False)
+        # The Anthropic SDK takes over a second to import; keep it off the --help path
+        from ai_analyzer import AsyncNewsAnalyzer
+        self.analyzer = AsyncNewsAnalyzer(
             api_key=api_key,
-            model=self.config.get('ai', {}).get('model', 'claude-sonnet-4-5-20250929')
+            model=ai_config.get('model', 'claude-sonnet-4-5-20250929'),
+            cache_path=ai_config.get('cache_path'),
+            analysis_cache_ttl=ai_config.get('analysis_cache_ttl', 60 * 60),
+            generation_cache_ttl=ai_config.get('generation_cache_ttl', 24 * 60 * 60),
+            batch_mode=ai_config.get('batch_mode', False),
+            analysis_max_tokens=ai_config.get('analysis_max_tokens', 2048),
+            analysis_temperature=ai_config.get('analysis_temperature', 0.0),
+            generation_max_tokens=ai_config.get('generation_max_tokens', 4000),
+            generation_temperature=ai_config.get('generation_temperature', 0.8)
         )
         self.formatter = NewsletterFormatter()
 
@@ -80,6 +99,7 @@ class NewsletterGenerator:
                 "Please create it based on config.rss.yaml"
             )
 
+        import yaml
         with open(config_file, 'r') as f:
             return yaml.safe_load(f)
 
@@ -94,6 +114,22 @@ class NewsletterGenerator:
         Returns:
             Path to the generated newsletter file
         """
+        return asyncio.run(self.agenerate(hours_ago=hours_ago, output_dir=output_dir))
+
+    async def agenerate(self, hours_ago: int = 24, output_dir: str = "output") -> str:
+        """
+        Generate the newsletter on the event loop
+
+        When newsletter.editions lists several name/audience pairs, every
+        edition is analyzed and written concurrently from the same articles.
+
+        Args:
+            hours_ago: Include articles from the last N hours
+            output_dir: Directory to save the newsletter
+
+        Returns:
+            Path to the generated newsletter file (the first edition's, if several)
+        """
         logger.info("=" * 60)
         logger.info("Starting AUTO newsletter generation (no selectors needed!)")
         logger.info("=" * 60)
@@ -101,7 +137,7 @@ class NewsletterGenerator:
         # Step 1: Scrape articles using RSS/auto-detection
         logger.info(f"\n[Step 1/4] Auto-scraping articles from the last {hours_ago} hours...")
         logger.info("Using RSS feeds and automatic content detection...")
-        articles = self.scraper.scrape_all_sources(hours_ago=hours_ago)
+        articles = await self.scraper.scrape_all_sources_async(hours_ago)
 
         if not articles:
             logger.error("No articles found! Check your RSS feed URLs or network connection.")
@@ -109,36 +145,89 @@ class NewsletterGenerator:
 
         logger.info(f"✓ Found {len(articles)} articles total")
 
-        # Step 2: Analyze and select top stories
-        logger.info("\n[Step 2/4] Analyzing articles with AI...")
         newsletter_config = self.config.get('newsletter', {})
         newsletter_settings = self.config.get('newsletter_settings', {})
-
-        audience = newsletter_config.get('audience', 'general readers')
         top_count = newsletter_settings.get('top_stories_count', 5)
 
         # Limit articles if configured
         max_articles = newsletter_settings.get('max_articles', len(articles))
         articles = articles[:max_articles]
 
-        analysis = self.analyzer.analyze_and_select_top_stories(
-            articles=articles,
-            audience=audience,
-            top_count=top_count
-        )
+        # Each edition is an independent pair of Claude calls over the same
+        # articles, so editions for different audiences run concurrently
+        editions = newsletter_config.get('editions') or [newsletter_config]
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_paths = await asyncio.gather(*(
+            self._generate_edition(
+                articles=articles,
+                newsletter_name=edition.get('name', newsletter_config.get('name', 'Daily Newsletter')),
+                audience=edition.get('audience', newsletter_config.get('audience', 'general readers')),
+                top_count=top_count,
+                output_path=self._output_path(
+                    output_dir, timestamp, edition, index if len(editions) > 1 else None
+                )
+            )
+            for index, edition in enumerate(editions, start=1)
+        ))
 
-        logger.info(f"✓ Identified {len(analysis.get('top_stories', []))} top stories")
-        logger.info(f"  Themes: {', '.join(analysis.get('themes', []))}")
+        logger.info("\n" + "=" * 60)
+        logger.info("Newsletter generation complete!")
+        logger.info("=" * 60)
 
-        # Step 3: Generate newsletter content
-        logger.info("\n[Step 3/4] Generating newsletter content...")
-        newsletter_name = newsletter_config.get('name', 'Daily Newsletter')
+        return output_paths[0]
 
-        content = self.analyzer.generate_newsletter_content(
-            analysis=analysis,
-            newsletter_name=newsletter_name,
-            style_guide=MORNING_BREW_STYLE
-        )
+    async def _generate_edition(
+        self,
+        articles: List[Article],
+        newsletter_name: str,
+        audience: str,
+        top_count: int,
+        output_path: Path
+    ) -> str:
+        """
+        Analyze, write and save one edition of the newsletter
+
+        Args:
+            articles: Scraped articles to choose from
+            newsletter_name: Name shown in the newsletter
+            audience: Readers the stories are selected for
+            top_count: Number of top stories to feature
+            output_path: File to save the newsletter to
+
+        Returns:
+            Path to the generated newsletter file
+        """
+        if self.single_call:
+            # Steps 2 and 3 in one Claude call, sending the article list once
+            logger.info(f"\n[Steps 2-3/4] Selecting stories and writing {newsletter_name}...")
+            analysis, content = await self.analyzer.analyze_and_generate(
+                articles=articles,
+                audience=audience,
+                top_count=top_count,
+                newsletter_name=newsletter_name,
+                style_guide=MORNING_BREW_STYLE
+            )
+
+            logger.info(f"✓ Identified {len(analysis.get('top_stories', []))} top stories")
+        else:
+            # Step 2: Analyze and select top stories
+            logger.info(f"\n[Step 2/4] Analyzing articles with AI for {newsletter_name}...")
+            analysis = await self.analyzer.analyze_and_select_top_stories(
+                articles=articles,
+                audience=audience,
+                top_count=top_count
+            )
+
+            logger.info(f"✓ Identified {len(analysis.get('top_stories', []))} top stories")
+            logger.info(f"  Themes: {', '.join(analysis.get('themes', []))}")
+
+            # Step 3: Generate newsletter content
+            logger.info(f"\n[Step 3/4] Generating newsletter content for {newsletter_name}...")
+            content = await self.analyzer.generate_newsletter_content(
+                analysis=analysis,
+                newsletter_name=newsletter_name,
+                style_guide=MORNING_BREW_STYLE
+            )
 
         logger.info("✓ Newsletter content generated")
 
@@ -150,13 +239,6 @@ class NewsletterGenerator:
             newsletter_name=newsletter_name
         )
 
-        # Create output directory if it doesn't exist
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
-
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_path = Path(output_dir) / f"newsletter_{timestamp}.html"
-
         self.formatter.save_newsletter(formatted_newsletter, str(output_path))
 
         logger.info(f"✓ Newsletter saved to: {output_path}")
@@ -165,12 +247,21 @@ class NewsletterGenerator:
         subject = self.formatter.extract_subject_line(content)
         logger.info(f"\n📧 Subject Line: {subject}")
 
-        logger.info("\n" + "=" * 60)
-        logger.info("Newsletter generation complete!")
-        logger.info("=" * 60)
-
         return str(output_path)
 
+    def _output_path(self, output_dir: str, timestamp: str, edition: Dict, index: Optional[int]) -> Path:
+        """Build the output file path, suffixing the edition number and name when there are several"""
+        # Create output directory if it doesn't exist
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+
+        filename = f"newsletter_{timestamp}"
+        if index is not None:
+            # The index keeps editions with the same (or no) name apart
+            slug = re.sub(r'[^a-z0-9]+', '-', edition.get('name', '').lower()).strip('-')
+            filename += f"_{index}_{slug or 'edition'}"
+
+        return Path(output_dir) / f"{filename}.html"
+
 
 def main():
     """Main entry point"""
@@ -3,27 +3,127 @@ Web Scraper Module
 Extracts news articles from configured websites
 """
 
+import asyncio
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from dateutil import parser as date_parser
-from typing import List, Dict, Optional
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 import logging
 
+from article import Article
+from html_select import (
+    absolute_url, compile_css, compile_css_attribute, compile_css_first, element_text,
+    parse_html
+)
+from http_client import (
+    ConditionalCache, charset_from_content_type, create_session, modified_before
+)
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=4096)
+def _parse_date(date_str: str) -> datetime:
+    """
+    Parse an article date into a naive datetime
+
+    RSS-style RFC 2822 and ISO 8601 dates are handled by the stdlib parsers;
+    only other formats go through the much slower dateutil parser. Results
+    are cached because listings repeat the same timestamps.
+
+    Args:
+        date_str: Date string from the page
+
+    Returns:
+        Parsed datetime with any timezone dropped
+
+    Raises:
+        ValueError: If the date cannot be parsed
+    """
+    article_date = None
+    try:
+        article_date = parsedate_to_datetime(date_str)
+    except (TypeError, ValueError, IndexError):
+        pass
+
+    if article_date is None:
+        try:
+            article_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        except ValueError:
+            # dateutil is slow to import and rarely needed, so load it on first use
+            from dateutil import parser as date_parser
+            article_date = date_parser.parse(date_str)
+
+    # Make timezone-naive for comparison
+    return article_date.replace(tzinfo=None)
+
+
+# Common main-content containers tried in order by get_article_content
+_CONTENT_SELECTORS = [compile_css(s) for s in (
+    'article',
+    '.article-content',
+    '.post-content',
+    '.entry-content',
+    'main'
+)]
+
+
 class ArticleScraper:
     """Scrapes articles from configured news sources"""
 
-    def __init__(self, sources: List[Dict]):
+    MAX_WORKERS = 16
+    POOL_SIZE = 32
+    MAX_ARTICLES_PER_SOURCE = 50
+
+    def __init__(
+        self,
+        sources: List[Dict],
+        cache_path: Optional[str] = None,
+        cache_expire_after: int = 0
+    ):
+        """
+        Args:
+            sources: Source configurations (name, url and CSS selectors)
+            cache_path: SQLite file for conditional-GET caching of pages (disabled if None)
+            cache_expire_after: Seconds a cached page is reused without revalidating
+        """
         self.sources = sources
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        self.session = create_session(self.headers, pool_size=self.POOL_SIZE)
+        self.http_cache = (
+            ConditionalCache(cache_path, expire_after=cache_expire_after) if cache_path else None
+        )
+        # Article text fetched during this run, keyed by URL
+        self._content_cache: Dict[str, Optional[str]] = {}
+
+    @staticmethod
+    def _compile_selectors(selectors: Dict) -> Dict:
+        """
+        Resolve a source's selector defaults and compile each selector
+
+        Per-article fields only ever use their first match, so they compile
+        to first-match expressions (the link straight to its href string).
+        compile_css caches compiled selectors, so this is cheap after the
+        first run; an invalid selector raises here, inside the per-source
+        error handling, so only that source is skipped.
+        """
+        return {
+            'article': compile_css(selectors.get('article', 'article')),
+            'title': compile_css_first(selectors.get('title', 'h2')),
+            'link': compile_css_attribute(selectors.get('link', 'a'), 'href'),
+            'date': compile_css_first(selectors.get('date', 'time')),
+            'description': (
+                compile_css_first(selectors['description']) if 'description' in selectors else None
+            )
+        }
 
-    def scrape_all_sources(self, hours_ago: int = 24) -> List[Dict]:
+    def scrape_all_sources(self, hours_ago: int = 24) -> List[Article]:
         """
         Scrape articles from all configured sources
 
@@ -31,39 +131,83 @@ class ArticleScraper:
             hours_ago: Only include articles from the last N hours
 
         Returns:
-            List of article dictionaries
+            List of articles
         """
         all_articles = []
-        cutoff_time = datetime.now() - timedelta(hours=hours_ago)
+        now = datetime.now()
+        cutoff_time = now - timedelta(hours=hours_ago)
+        # One timestamp for the whole run instead of one per article
+        run_ts = now.isoformat()
 
-        for source in self.sources:
-            logger.info(f"Scraping {source['name']}...")
-            try:
-                articles = self._scrape_source(source, cutoff_time)
-                all_articles.extend(articles)
-                logger.info(f"Found {len(articles)} articles from {source['name']}")
-            except Exception as e:
-                logger.error(f"Error scraping {source['name']}: {str(e)}")
+        if not self.sources:
+            return all_articles
+
+        # Sources are independent network fetches, so scrape them concurrently.
+        # Results are collected in config order to keep the article list stable.
+        max_workers = min(self.MAX_WORKERS, len(self.sources))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._scrape_one, source, cutoff_time, run_ts)
+                for source in self.sources
+            ]
+            for future in futures:
+                all_articles.extend(future.result())
 
         return all_articles
 
-    def _scrape_source(self, source: Dict, cutoff_time: datetime) -> List[Dict]:
-        """Scrape a single news source"""
+    async def scrape_all_sources_async(self, hours_ago: int = 24) -> List[Article]:
+        """
+        Async version of scrape_all_sources
+
+        Each source is scraped on the event loop's default executor, so the
+        caller can await the scrape alongside other coroutines.
+
+        Args:
+            hours_ago: Only include articles from the last N hours
+
+        Returns:
+            List of articles
+        """
+        now = datetime.now()
+        cutoff_time = now - timedelta(hours=hours_ago)
+        run_ts = now.isoformat()
+
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(None, self._scrape_one, source, cutoff_time, run_ts)
+            for source in self.sources
+        ))
+
+        return [article for articles in results for article in articles]
+
+    def _scrape_one(self, source: Dict, cutoff_time: datetime, run_ts: str) -> List[Article]:
+        """Scrape a single source, logging and swallowing any errors"""
+        logger.info(f"Scraping {source['name']}...")
         try:
-            response = requests.get(source['url'], headers=self.headers, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'lxml')
+            articles = self._scrape_source(source, cutoff_time, run_ts)
+            logger.info(f"Found {len(articles)} articles from {source['name']}")
+            return articles
+        except Exception as e:
+            logger.error(f"Error scraping {source['name']}: {str(e)}")
+            return []
 
+    def _scrape_source(self, source: Dict, cutoff_time: datetime, run_ts: str) -> List[Article]:
+        """Scrape a single news source"""
+        try:
             articles = []
-            selectors = source['selectors']
+            selectors = self._compile_selectors(source.get('selectors', {}))
 
-            # Find all article elements
-            article_elements = soup.select(selectors.get('article', 'article'))
+            # Find the first article elements
+            article_elements = self._find_article_elements(
+                source['url'], selectors['article'], cutoff_time
+            )
 
-            for element in article_elements[:50]:  # Limit to first 50 articles
+            for element in article_elements:
                 try:
-                    article = self._extract_article_data(element, selectors, source['name'], source['url'])
-                    if article and self._is_recent(article.get('date'), cutoff_time):
+                    article = self._extract_article_data(
+                        element, selectors, source['name'], source['url'], run_ts
+                    )
+                    if article and self._is_recent(article.date, cutoff_time):
                         articles.append(article)
                 except Exception as e:
                     logger.debug(f"Error extracting article: {str(e)}")
@@ -75,46 +219,106 @@ class ArticleScraper:
             logger.error(f"Request failed for {source['url']}: {str(e)}")
             return []
 
-    def _extract_article_data(self, element, selectors: Dict, source_name: str, base_url: str) -> Optional[Dict]:
-        """Extract article data from HTML element"""
-        title_elem = element.select_one(selectors.get('title', 'h2'))
-        if not title_elem:
+    def _find_article_elements(
+        self,
+        url: str,
+        article_selector: etree.XPath,
+        cutoff_time: datetime
+    ) -> List:
+        """
+        Return the first MAX_ARTICLES_PER_SOURCE article elements of a page
+
+        Uncached pages are streamed into a pull parser and the download stops
+        once one more article than needed has started, since only the top of
+        a listing page is used. The selector is run over the partial tree at
+        doubling byte offsets, so checking costs about as much as one run over
+        the whole page. A page whose Last-Modified predates the cutoff cannot
+        hold recent articles and is not parsed at all.
+        """
+        limit = self.MAX_ARTICLES_PER_SOURCE
+        if self.http_cache is not None:
+            result = self.http_cache.fetch(self.session, url, timeout=10)
+            if modified_before(result.last_modified, cutoff_time):
+                logger.info(f"Skipping {url}: not modified since {result.last_modified}")
+                return []
+            tree = parse_html(result.content, charset_from_content_type(result.content_type))
+            return article_selector(tree)[:limit]
+
+        root = None
+        bytes_read = 0
+        next_check = 16384
+        with self.session.get(url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            last_modified = response.headers.get('Last-Modified')
+            if modified_before(last_modified, cutoff_time):
+                logger.info(f"Skipping {url}: not modified since {last_modified}")
+                return []
+
+            parser = etree.HTMLPullParser(
+                events=('start',),
+                encoding=charset_from_content_type(response.headers.get('Content-Type'))
+            )
+
+            for chunk in response.iter_content(chunk_size=16384):
+                parser.feed(chunk)
+                for _, element in parser.read_events():
+                    if root is None:
+                        root = element
+                bytes_read += len(chunk)
+                if root is None or bytes_read < next_check:
+                    continue
+                if len(article_selector(root)) > limit:
+                    break
+                next_check *= 2
+
+        root = parser.close()
+        return article_selector(root)[:limit] if root is not None else []
+
+    def _extract_article_data(
+        self,
+        element,
+        selectors: Dict,
+        source_name: str,
+        base_url: str,
+        run_ts: str
+    ) -> Optional[Article]:
+        """Extract article data from HTML element using the source's compiled selectors"""
+        title_elems = selectors['title'](element)
+        if not title_elems:
             return None
 
-        title = title_elem.get_text(strip=True)
+        title = element_text(title_elems[0])
         if not title:
             return None
 
         # Extract link
-        link_elem = element.select_one(selectors.get('link', 'a'))
-        link = link_elem.get('href', '') if link_elem else ''
+        link = selectors['link'](element)
 
         # Make link absolute if relative
-        if link and not link.startswith('http'):
-            from urllib.parse import urljoin
-            link = urljoin(base_url, link)
+        if link:
+            link = absolute_url(link, base_url)
 
         # Extract date if available
-        date_elem = element.select_one(selectors.get('date', 'time'))
+        date_elems = selectors['date'](element)
         date_str = None
-        if date_elem:
-            date_str = date_elem.get('datetime') or date_elem.get_text(strip=True)
+        if date_elems:
+            date_str = date_elems[0].get('datetime') or element_text(date_elems[0])
 
         # Extract description/summary if available
         description = ""
-        if 'description' in selectors:
-            desc_elem = element.select_one(selectors['description'])
-            if desc_elem:
-                description = desc_elem.get_text(strip=True)
+        if selectors['description'] is not None:
+            desc_elems = selectors['description'](element)
+            if desc_elems:
+                description = element_text(desc_elems[0])
 
-        return {
-            'title': title,
-            'link': link,
-            'source': source_name,
-            'date': date_str,
-            'description': description,
-            'scraped_at': datetime.now().isoformat()
-        }
+        return Article(
+            title=title,
+            link=link,
+            source=source_name,
+            date=date_str,
+            description=description,
+            scraped_at=run_ts
+        )
 
     def _is_recent(self, date_str: Optional[str], cutoff_time: datetime) -> bool:
         """Check if article date is recent enough"""
@@ -123,38 +327,41 @@ class ArticleScraper:
             return True
 
         try:
-            article_date = date_parser.parse(date_str)
-            # Make timezone-naive for comparison
-            if article_date.tzinfo:
-                article_date = article_date.replace(tzinfo=None)
-            return article_date >= cutoff_time
+            return _parse_date(date_str) >= cutoff_time
         except Exception:
             # If we can't parse the date, include it
             return True
 
+    def _fetch(self, url: str) -> Tuple[bytes, Optional[str]]:
+        """GET a URL through the conditional cache when one is configured, returning body and charset"""
+        if self.http_cache is not None:
+            result = self.http_cache.fetch(self.session, url, timeout=10)
+            return result.content, charset_from_content_type(result.content_type)
+
+        response = self.session.get(url, timeout=10)
+        response.raise_for_status()
+        return response.content, charset_from_content_type(response.headers.get('Content-Type'))
+
     def get_article_content(self, url: str) -> Optional[str]:
-        """Fetch full article content from URL"""
+        """Fetch full article content from URL, reusing text fetched earlier in this run"""
+        if url not in self._content_cache:
+            self._content_cache[url] = self._fetch_article_content(url)
+        return self._content_cache[url]
+
+    def _fetch_article_content(self, url: str) -> Optional[str]:
+        """Fetch and extract the main text of an article page"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'lxml')
+            tree = parse_html(*self._fetch(url))
 
             # Try to find main content (common patterns)
-            content_selectors = [
-                'article',
-                '.article-content',
-                '.post-content',
-                '.entry-content',
-                'main'
-            ]
-
-            for selector in content_selectors:
-                content = soup.select_one(selector)
-                if content:
-                    # Get text, removing scripts and styles
-                    for script in content(['script', 'style']):
-                        script.decompose()
-                    return content.get_text(strip=True, separator='\n')
+            for selector in _CONTENT_SELECTORS:
+                matches = selector(tree)
+                if matches:
+                    content = matches[0]
+                    # Get text, removing scripts and styles in one libxml2 pass
+                    # (their tail text belongs to the parent and is kept)
+                    etree.strip_elements(content, 'script', 'style', with_tail=False)
+                    return element_text(content, separator='\n')
 
             return None
 